@@ -1,20 +1,25 @@
+import asyncio
+import functools
+import itertools
+import json
 import os
 import re
 import logging
-from datetime import datetime
+from datetime import date, datetime, timezone
 from typing import List, Dict, Optional
 
 from dotenv import load_dotenv
 from dateutil.parser import parse
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from aiogoogle import Aiogoogle
+from aiogoogle.auth.creds import ServiceAccountCreds
 
 load_dotenv()
 
 SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE')
 SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
-SHEET_NAME = f"{datetime.now().strftime('%B').upper()} - {datetime.now().strftime('%Y')}"
+_NOW = datetime.now()
+SHEET_NAME = f"{_NOW.strftime('%B').upper()} - {_NOW.strftime('%Y')}"
 RANGES = [
     f"{SHEET_NAME}!A:A",
     f"{SHEET_NAME}!B:B",
@@ -23,109 +28,139 @@ RANGES = [
     f"{SHEET_NAME}!I:I",
     f"{SHEET_NAME}!L:L"
 ]
+HEADERS = ('assignment', 'customerName', 'handleBy', 'checked', 'dueDate', 'handOver')
+_CHECKED_IDX = HEADERS.index('checked')
+_HANDOVER_IDX = HEADERS.index('handOver')
+_DUE_IDX = HEADERS.index('dueDate')
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+# Strict aliases for the pipeline stages; precise enough for mypyc to
+# compile this module unchanged should the sheet ever grow large.
+Columns = Dict[str, List[Optional[object]]]
+Row = Dict[str, Optional[object]]
+GroupedData = Dict[str, List[Row]]
 
-def camel_case(text: str) -> str:
-    text = re.sub(r'(_|-)+', ' ', text).strip().lower()
-    words = text.split(' ')
-    return words[0] + ''.join(word.title() for word in words[1:])
+_MISSING = object()
 
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_DATE_FORMATS = ('%m/%d/%Y', '%d/%m/%Y')
 
-def fetch_data() -> List[Dict[str, Optional[object]]]:
+
+@functools.lru_cache(maxsize=1)
+def _get_service_account_creds() -> ServiceAccountCreds:
     """
-    Fetch specified column ranges from Google Sheets
-    and return list of dictionaries with camelCase keys.
+    Lazily loads the service-account key once and reuses it across
+    calls, avoiding a key-file read and parse per fetch.
     """
-    creds = service_account.Credentials.from_service_account_file(
-        SERVICE_ACCOUNT_FILE, scopes=SCOPES)
+    with open(SERVICE_ACCOUNT_FILE, 'r') as f:
+        info = json.load(f)
+    return ServiceAccountCreds(scopes=SCOPES, **info)
 
-    service = build('sheets', 'v4', credentials=creds)
-    sheet = service.spreadsheets()
 
-    all_data = {}
-    for range_name in RANGES:
+def _parse_date(text: str) -> Optional[date]:
+    """
+    Parses a date string, trying the ISO YYYY-MM-DD fast path first,
+    then the slash formats the sheet has been seen to use, and only
+    then dateutil's format-guessing parser.
+    """
+    if _ISO_DATE.match(text):
+        try:
+            return date.fromisoformat(text[:10])
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
         try:
-            result = sheet.values().get(spreadsheetId=SPREADSHEET_ID,
-                                        range=range_name).execute()
-            values = result.get('values', [])
-            all_data[range_name] = values
-        except Exception as e:
-            logging.error(f"Failed to fetch range {range_name}: {e}")
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return parse(text).date()
+    except Exception:
+        return None
+
+
+async def fetch_data() -> Columns:
+    """
+    Fetch specified column ranges from Google Sheets
+    and return parallel column lists keyed by camelCase header.
+    """
+    all_data = {}
+    try:
+        async with Aiogoogle(service_account_creds=_get_service_account_creds()) as aiogoogle:
+            sheets = await aiogoogle.discover('sheets', 'v4')
+            result = await aiogoogle.as_service_account(
+                sheets.spreadsheets.values.batchGet(spreadsheetId=SPREADSHEET_ID,
+                                                    ranges=RANGES,
+                                                    majorDimension='COLUMNS'))
+        value_ranges = result.get('valueRanges', [])
+        for range_name, value_range in zip(RANGES, value_ranges):
+            values = value_range.get('values', [])
+            all_data[range_name] = values[0] if values else []
+    except Exception as e:
+        logging.error(f"Failed to fetch ranges: {e}")
+        for range_name in RANGES:
             all_data[range_name] = []
 
-    headers = []
-    for r in RANGES:
-        header = all_data[r][0][0] if all_data[r] and len(all_data[r]) > 0 and len(all_data[r][0]) > 0 else ''
-        headers.append(camel_case(header))
-
-    data_list = []
-    num_rows = len(all_data[RANGES[0]]) - 1 if all_data[RANGES[0]] else 0
-    for i in range(1, num_rows + 1):
-        row = {}
-        for idx, r in enumerate(RANGES):
-            values = all_data[r]
-            val = values[i][0] if i < len(values) and len(values[i]) > 0 else ''
-            row[headers[idx]] = val
-        data_list.append(row)
-
-    for row in data_list:
-        row['checked'] = not (str(row.get('checked', '')).strip().lower() == 'not yet')
-        row['handOver'] = not (str(row.get('handOver', '')).strip().lower() == 'not yet')
-
-        due_date_str = row.get('dueDate', '').strip()
-        if due_date_str:
-            try:
-                row['dueDate'] = parse(due_date_str).date()
-            except Exception:
-                row['dueDate'] = None
-        else:
-            row['dueDate'] = None
+    data: Columns = {header: [] for header in HEADERS}
 
-    return data_list
+    columns = [all_data[r][1:] for r in RANGES]
+    out_lists = [data[header] for header in HEADERS]
 
+    today = datetime.now(timezone.utc).date()
+    date_cache: Dict[str, Optional[date]] = {}
+    for row_values in itertools.zip_longest(*columns, fillvalue=''):
+        values = list(row_values)
 
-def filter_not_yet(data_list: List[Dict[str, Optional[object]]]) -> List[Dict[str, Optional[object]]]:
-    """
-    Filters rows where checked or handOver is 'not yet' (case-insensitive)
-    and dueDate is today or in the future.
-    """
-    filtered = []
-    today = datetime.now().date()
+        values[_CHECKED_IDX] = not (str(values[_CHECKED_IDX]).strip().lower() == 'not yet')
+        values[_HANDOVER_IDX] = not (str(values[_HANDOVER_IDX]).strip().lower() == 'not yet')
 
-    for row in data_list:
-        checked_val = row.get('checked', False)
-        handover_val = row.get('handOver', False)
-        due_date = row.get('dueDate')
+        due_date_str = str(values[_DUE_IDX]).strip()
+        if due_date_str:
+            due_date = date_cache.get(due_date_str, _MISSING)
+            if due_date is _MISSING:
+                due_date = _parse_date(due_date_str)
+                date_cache[due_date_str] = due_date
+            values[_DUE_IDX] = due_date
+        else:
+            values[_DUE_IDX] = None
+
+        if (not values[_CHECKED_IDX] or not values[_HANDOVER_IDX]) \
+                and values[_DUE_IDX] is not None and values[_DUE_IDX] >= today:
+            for out, val in zip(out_lists, values):
+                out.append(val)
 
-        due_date_valid = due_date is not None and due_date >= today
+    return data
 
-        if (not checked_val or not handover_val) and due_date_valid:
-            filtered.append(row)
 
-    return filtered
+def filter_not_yet(data: Columns) -> Columns:
+    """
+    Kept for API compatibility: filtering of 'not yet' rows with a
+    current or future dueDate now happens inline in fetch_data().
+    """
+    return data
 
 
-def group_by_handle_by(data_list: List[Dict[str, Optional[object]]]) -> Dict[str, List[Dict[str, Optional[object]]]]:
+def group_by_handle_by(data: Columns) -> GroupedData:
     """
-    Groups data by the 'handleBy' field (lowercased),
+    Groups data by the 'handleBy' column (lowercased),
     removing 'handleBy' from each row dictionary.
     """
-    grouped = {}
-    for row in data_list:
-        key = row.get('handleBy', '')
+    grouped: GroupedData = {}
+    handle_by_column = data.get('handleBy', [])
+    row_headers = [header for header in data if header != 'handleBy']
+    row_columns = [data[header] for header in row_headers]
+    for key, *values in zip(handle_by_column, *row_columns):
         if not key:
             continue
 
         key = str(key).strip().lower()
-        row_copy = {k: v for k, v in row.items() if k != 'handleBy'}
-        grouped.setdefault(key, []).append(row_copy)
+        grouped.setdefault(key, []).append(dict(zip(row_headers, values)))
 
     return grouped
 
 
-def print_grouped_data(grouped_data: Dict[str, List[Dict[str, Optional[object]]]]) -> None:
+def print_grouped_data(grouped_data: GroupedData) -> None:
     """
     Nicely prints grouped data showing handler and assignments.
     Uses the 'assignment' field as the title and excludes it from details.
@@ -141,13 +176,13 @@ def print_grouped_data(grouped_data: Dict[str, List[Dict[str, Optional[object]]]
         print()
 
 
-def get_grouped_data() -> Dict[str, List[Dict[str, Optional[object]]]]:
-    data_list = fetch_data()
+async def get_grouped_data() -> GroupedData:
+    data_list = await fetch_data()
     filtered_data_list = filter_not_yet(data_list)
     grouped_data_list = group_by_handle_by(filtered_data_list)
     return grouped_data_list
 
 
 if __name__ == '__main__':
-    grouped = get_grouped_data()
+    grouped = asyncio.run(get_grouped_data())
     print_grouped_data(grouped)
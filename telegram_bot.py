@@ -1,13 +1,19 @@
+import asyncio
+import functools
+import hashlib
 import os
-import time
 import json
-import re
 import logging
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List
 
 from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from telegram import Bot
 from telegram.error import RetryAfter, NetworkError
 
@@ -19,19 +25,36 @@ TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_IDS_FILE = os.getenv('TELEGRAM_IDS_FILE')
 MAX_RETRIES = 5
 RETRY_DELAY_SECONDS = 5
+MAX_CONCURRENT_SENDS = 30  # Telegram's global limit is ~30 messages/second
+TELEGRAM_MESSAGE_LIMIT = 4096
 
 bot = Bot(token=TOKEN)
 
+_MD_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in r'_*[]()~`>#+-=|{}.!'})
+
+_ASSIGNMENT_PREFIX = "• *Assignment:* "
+_CUSTOMER_PREFIX = "  *Customer:* "
+_STATUS_PREFIX = "  *Status:* "
+
+_DUE_SOON = ("Due today", "Due in 1 day")
+
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 
+@functools.lru_cache(maxsize=1)
+def _load_telegram_ids_cached(file_path: str, mtime: float) -> Dict[str, int]:
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def load_telegram_ids(file_path: str = TELEGRAM_IDS_FILE) -> Dict[str, int]:
     """
     Loads handler name to Telegram ID mapping from JSON file.
+    Cached on the file's mtime so unchanged files are not re-parsed.
     """
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        return _load_telegram_ids_cached(file_path, os.path.getmtime(file_path))
     except Exception as e:
         logging.error(f"Failed to load telegram IDs from {file_path}: {e}")
         return {}
@@ -41,10 +64,7 @@ def escape_markdown(text: str) -> str:
     """
     Escapes Telegram MarkdownV2 special characters.
     """
-    if not text:
-        return ''
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
+    return text.translate(_MD_ESCAPE_TABLE) if text else ''
 
 
 def generate_messages(grouped_data: Dict[str, List[Dict]]) -> Dict[str, List[str]]:
@@ -53,30 +73,29 @@ def generate_messages(grouped_data: Dict[str, List[Dict]]) -> Dict[str, List[str
     Bold assignment, customerName, dueDate and 'not checked'/'not handed over' if applicable.
     """
     messages = {}
-    today = datetime.now().date()
-    today_str = today.strftime('%Y-%m-%d')
+    today = datetime.now(timezone.utc).date()
+    heading = f"📋 *Your Assignments as of {escape_markdown(today.isoformat())}:*"
 
     for handler, assignments in grouped_data.items():
-        heading = f"📋 *Your Assignments as of {escape_markdown(today_str)}:*"
         lines = [heading]
 
-        for assignment in assignments:
+        days_remaining_list = [
+            (due - today).days if (due := assignment.get('dueDate')) else None
+            for assignment in assignments
+        ]
+
+        for assignment, days_remaining in zip(assignments, days_remaining_list):
             assignment_name = escape_markdown(str(assignment.get('assignment', 'No Assignment')))
             customer_name = escape_markdown(str(assignment.get('customerName', 'Unknown Customer')))
-            due_date = assignment.get('dueDate')
-
-            if due_date:
-                days_remaining = (due_date - today).days
-                if days_remaining < 0:
-                    due_str = "Past due!"
-                elif days_remaining == 0:
-                    due_str = "Due today"
-                elif days_remaining == 1:
-                    due_str = "Due in 1 day"
-                else:
-                    due_str = f"Due in {days_remaining} days"
-            else:
+
+            if days_remaining is None:
                 due_str = "No due date"
+            elif days_remaining < 0:
+                due_str = "Past due!"
+            elif days_remaining <= 1:
+                due_str = _DUE_SOON[days_remaining]
+            else:
+                due_str = f"Due in {days_remaining} days"
 
             due_str = escape_markdown(due_str)
 
@@ -86,65 +105,89 @@ def generate_messages(grouped_data: Dict[str, List[Dict]]) -> Dict[str, List[str
             checked_str = "checked" if checked else "not checked"
             handover_str = "handed over" if handover else "not handed over"
 
-            line = (
-                f"• *Assignment:* {assignment_name}\n"
-                f"  *Customer:* {customer_name}\n"
-                f"  *Status:* {checked_str} and {handover_str}\n"
-                f"  *{due_str}*"
-            )
-
-            lines.append(line)
+            lines.extend((
+                '',
+                _ASSIGNMENT_PREFIX + assignment_name,
+                _CUSTOMER_PREFIX + customer_name,
+                _STATUS_PREFIX + checked_str + " and " + handover_str,
+                "  *" + due_str + "*",
+            ))
 
-        full_message = '\n\n'.join(lines)
-        messages[handler] = [full_message]
+        messages[handler] = ['\n'.join(lines)]
 
     return messages
 
 
-def send_messages(telegram_ids: Dict[str, int], messages: Dict[str, List[str]]):
+async def _send_one(handler: str, telegram_id: int, msg: str,
+                    semaphore: asyncio.Semaphore) -> None:
+    """
+    Sends a single message with retry handling for rate limits and
+    network errors.
     """
-    Sends messages to telegram users based on handler -> telegram_id mapping.
+    attempts = 0
+    while attempts < MAX_RETRIES:
+        try:
+            async with semaphore:
+                await bot.send_message(chat_id=telegram_id, text=msg, parse_mode='MarkdownV2')
+            logging.info(f"Sent message to {handler} ({telegram_id})")
+            return
+        except RetryAfter as e:
+            logging.warning(f"Rate limited. Sleeping {e.retry_after}s")
+            await asyncio.sleep(e.retry_after)
+        except NetworkError as e:
+            logging.warning(f"Network error: {e}. Retrying in {RETRY_DELAY_SECONDS}s...")
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+        except Exception as e:
+            logging.error(f"Failed to send message to {handler}: {e}\n{traceback.format_exc()}")
+            return
+        attempts += 1
+
+
+async def send_messages(telegram_ids: Dict[str, int], messages: Dict[str, List[str]]):
     """
+    Sends messages to telegram users concurrently based on
+    handler -> telegram_id mapping.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+    tasks = []
+    scheduled = set()
     for handler, msgs in messages.items():
         telegram_id = telegram_ids.get(handler)
         if not telegram_id:
             logging.warning(f"No Telegram ID found for handler '{handler}', skipping.")
             continue
 
+        msgs = [msg for msg in msgs if msg.strip()]
+        if not msgs:
+            logging.warning(f"Empty message for handler {handler}, skipping.")
+            continue
+
+        if len(msgs) > 1:
+            combined = '\n\n'.join(msgs)
+            if len(combined) <= TELEGRAM_MESSAGE_LIMIT:
+                msgs = [combined]
+
         for msg in msgs:
-            if not msg.strip():
-                logging.warning(f"Empty message for handler {handler}, skipping.")
+            key = (telegram_id, hashlib.blake2b(msg.encode()).digest())
+            if key in scheduled:
+                logging.info(f"Skipping duplicate message for {handler} ({telegram_id})")
                 continue
+            scheduled.add(key)
+            tasks.append(_send_one(handler, telegram_id, msg, semaphore))
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
-            sent = False
-            attempts = 0
-            while not sent and attempts < MAX_RETRIES:
-                try:
-                    bot.send_message(chat_id=telegram_id, text=msg, parse_mode='MarkdownV2')
-                    logging.info(f"Sent message to {handler} ({telegram_id})")
-                    sent = True
-                except RetryAfter as e:
-                    logging.warning(f"Rate limited. Sleeping {e.retry_after}s")
-                    time.sleep(e.retry_after)
-                except NetworkError as e:
-                    logging.warning(f"Network error: {e}. Retrying in {RETRY_DELAY_SECONDS}s...")
-                    time.sleep(RETRY_DELAY_SECONDS)
-                except Exception as e:
-                    logging.error(f"Failed to send message to {handler}: {e}\n{traceback.format_exc()}")
-                    break
-                attempts += 1
-
-
-def main():
+async def main():
     telegram_ids = load_telegram_ids()
     if not telegram_ids:
         logging.error("No Telegram IDs loaded, exiting.")
         return
 
-    grouped_data = get_grouped_data()
+    grouped_data = await get_grouped_data()
     messages = generate_messages(grouped_data)
-    send_messages(telegram_ids, messages)
+    await send_messages(telegram_ids, messages)
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())